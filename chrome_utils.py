@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 """Chrome CDP utilities for browser automation."""
 
+import errno
+import http.client
 import os
 import platform
+import selectors
 import shutil
+import signal
 import socket
 import subprocess
 import time
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -14,7 +19,12 @@ CDP_PORT = 9222
 CDP_URL = f"http://127.0.0.1:{CDP_PORT}"
 XVFB_DISPLAY = ":99"
 
+# has_real_display() result cache: (display, checked_at, result)
+_DISPLAY_CACHE_TTL = 5.0
+_display_cache: tuple[str, float, bool] | None = None
 
+
+@lru_cache(maxsize=1)
 def find_chrome() -> str | None:
     """Find Chrome executable path across platforms."""
     if platform.system() == "Darwin":
@@ -44,11 +54,16 @@ def wake_screen() -> bool:
         )
         if "Monitor is Off" in result.stdout:
             print("🖥️ 屏幕未亮，正在唤醒...")
-            # Wake the screen with mouse movement and key press
-            subprocess.run(["xdotool", "mousemove_relative", "1", "1"], capture_output=True, timeout=2)
-            subprocess.run(["xdotool", "mousemove_relative", "--", "-1", "-1"], capture_output=True, timeout=2)
-            subprocess.run(["xdotool", "key", "shift"], capture_output=True, timeout=2)
-            time.sleep(0.5)
+            # Wake the screen with mouse movement and key press, chained in one
+            # xdotool call. The X server leaves DPMS off as soon as it handles the
+            # input event, so there is nothing to sleep for afterwards.
+            subprocess.run(
+                ["xdotool", "mousemove_relative", "1", "1",
+                 "mousemove_relative", "--", "-1", "-1",
+                 "key", "shift"],
+                capture_output=True,
+                timeout=3,
+            )
             print("✅ 屏幕已唤醒")
             return True
         return True
@@ -58,22 +73,106 @@ def wake_screen() -> bool:
         return True
 
 
-def is_port_open(port: int) -> bool:
-    """Check if a port is open."""
+def is_port_open(port: int, timeout: float = 0.05) -> bool:
+    """Check if a port is open with a non-blocking connect (waits at most timeout)."""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(1)
-        return s.connect_ex(("127.0.0.1", port)) == 0
+        s.setblocking(False)
+        err = s.connect_ex(("127.0.0.1", port))
+        if err == 0:
+            return True
+        if err not in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+            return False
+        with selectors.DefaultSelector() as sel:
+            sel.register(s, selectors.EVENT_WRITE)
+            if not sel.select(timeout):
+                return False
+        return s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+
+
+def is_cdp_ready(port: int = CDP_PORT) -> bool:
+    """Check if DevTools is actually serving on the port (not just listening)."""
+    # Cheap TCP pre-check so a closed port never pays for the HTTP attempt
+    if not is_port_open(port):
+        return False
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=0.2)
+    try:
+        conn.request("GET", "/json/version")
+        return conn.getresponse().status == 200
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        conn.close()
+
+
+def _tail(path: Path, lines: int = 10) -> str:
+    """Return the last few lines of a log file."""
+    try:
+        return "\n".join(path.read_text(errors="replace").splitlines()[-lines:])
+    except OSError:
+        return ""
+
+
+def wait_for_cdp(
+    port: int = CDP_PORT,
+    timeout: float = 10.0,
+    interval: float = 0.05,
+    proc: subprocess.Popen | None = None,
+    stderr_log: Path | None = None,
+    max_interval: float = 0.4,
+) -> bool:
+    """Poll /json/version until DevTools responds or the deadline passes.
+
+    The poll interval starts at interval and doubles up to max_interval, so a
+    fast start is noticed almost immediately without spinning on a slow one.
+    If the launched Chrome process is given, bail out as soon as it exits.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if is_cdp_ready(port):
+            return True
+        if proc is not None and proc.poll() is not None:
+            print(f"❌ Chrome 已退出 rc={proc.returncode}")
+            tail = _tail(stderr_log) if stderr_log else ""
+            if tail:
+                print(tail)
+            return False
+        time.sleep(interval)
+        interval = min(interval * 2, max_interval)
+    return False
 
 
 def has_real_display() -> bool:
-    """Check if a real (non-virtual) display is available."""
+    """Check if a real (non-virtual) display is available.
+
+    The probe result is cached for a few seconds per DISPLAY value.
+    """
+    global _display_cache
     display = os.environ.get("DISPLAY", "")
+    now = time.monotonic()
+    if _display_cache is not None:
+        cached_display, checked_at, cached_result = _display_cache
+        if cached_display == display and now - checked_at < _DISPLAY_CACHE_TTL:
+            return cached_result
+    result = _probe_display(display)
+    _display_cache = (display, now, result)
+    return result
+
+
+def _probe_display(display: str) -> bool:
+    """Probe whether the given DISPLAY is a working, non-Xvfb display."""
     # Skip if it's our Xvfb display
     if display == XVFB_DISPLAY:
         return False
     if not display:
         return False
-    # Try to verify the display is actually working
+    # Local display (":N" or ":N.S"): the X server's unix socket is enough of a signal
+    if display.startswith(":"):
+        number = display[1:].split(".", 1)[0]
+        if number.isdigit():
+            return os.path.exists(f"/tmp/.X11-unix/X{number}")
+    # Remote / unusual DISPLAY: verify the display is actually working
+    if not shutil.which("xdpyinfo"):
+        return False
     result = subprocess.run(
         ["xdpyinfo"],
         capture_output=True,
@@ -83,11 +182,84 @@ def has_real_display() -> bool:
     return result.returncode == 0
 
 
+def find_pids(pattern: str, comm: str | None = None) -> list[int]:
+    """Find pids whose command line contains pattern by scanning /proc (no pgrep fork).
+
+    If comm is given, only processes with that exact name are considered, so
+    cmdline is read just for the few candidates.
+    """
+    pids = []
+    own_pid = os.getpid()
+    with os.scandir("/proc") as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            pid = int(entry.name)
+            if pid == own_pid:
+                continue
+            try:
+                if comm is not None:
+                    with open(f"/proc/{pid}/comm", "rb") as f:
+                        if f.read().rstrip(b"\n") != comm.encode():
+                            continue
+                with open(f"/proc/{pid}/cmdline", "rb") as f:
+                    cmdline = f.read().replace(b"\0", b" ")
+            except (FileNotFoundError, ProcessLookupError, PermissionError):
+                # Process exited mid-scan or is not ours to inspect
+                continue
+            if pattern.encode() in cmdline:
+                pids.append(pid)
+    return pids
+
+
+def kill_processes(pattern: str, sig: int = signal.SIGKILL) -> None:
+    """Send sig (SIGKILL by default) to every process whose command line contains pattern."""
+    for pid in find_pids(pattern):
+        try:
+            os.kill(pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def process_running(pattern: str) -> bool:
+    """Whether any process command line contains pattern (pgrep on macOS, which has no /proc)."""
+    # "--" ends option parsing: our patterns themselves start with "--"
+    if platform.system() == "Darwin":
+        return subprocess.run(["pgrep", "-f", "--", pattern], capture_output=True).returncode == 0
+    return bool(find_pids(pattern))
+
+
+def terminate_processes(pattern: str, grace: float = 0.5) -> None:
+    """SIGTERM matching processes, then SIGKILL whatever is still alive after grace seconds.
+
+    SIGTERM lets Chrome flush its profile to disk; the poll returns as soon as
+    every process is gone instead of sleeping a fixed amount.
+    """
+    is_mac = platform.system() == "Darwin"
+    if is_mac:
+        subprocess.run(["pkill", "-TERM", "-f", "--", pattern], capture_output=True)
+    else:
+        kill_processes(pattern, signal.SIGTERM)
+
+    deadline = time.monotonic() + grace
+    while process_running(pattern):
+        if time.monotonic() >= deadline:
+            if is_mac:
+                subprocess.run(["pkill", "-9", "-f", "--", pattern], capture_output=True)
+            else:
+                kill_processes(pattern, signal.SIGKILL)
+            return
+        time.sleep(0.05)
+
+
+def _xvfb_running() -> bool:
+    """Check if Xvfb is already running on our display."""
+    return bool(find_pids(f" {XVFB_DISPLAY}", comm="Xvfb"))
+
+
 def ensure_xvfb() -> bool:
     """Ensure Xvfb is running for headless display."""
-    # Check if Xvfb is already running on our display
-    result = subprocess.run(["pgrep", "-f", f"Xvfb {XVFB_DISPLAY}"], capture_output=True)
-    if result.returncode == 0:
+    if _xvfb_running():
         os.environ["DISPLAY"] = XVFB_DISPLAY
         return True
 
@@ -104,7 +276,11 @@ def ensure_xvfb() -> bool:
 
 def ensure_chrome_cdp() -> bool:
     """Ensure Chrome is running with CDP enabled."""
-    if is_port_open(CDP_PORT):
+    if is_cdp_ready(CDP_PORT):
+        return True
+
+    # A CDP Chrome that is still starting up only needs a moment, not a restart
+    if process_running(f"--remote-debugging-port={CDP_PORT}") and wait_for_cdp(CDP_PORT, timeout=3.0):
         return True
 
     chrome_bin = find_chrome()
@@ -132,15 +308,13 @@ def ensure_chrome_cdp() -> bool:
 
     print(f"CDP 端口 {CDP_PORT} 未开启，正在启动 Chrome...")
 
-    # Kill existing Chrome processes
-    if is_mac:
-        subprocess.run(["pkill", "-9", "-f", "Google Chrome"], capture_output=True)
-    else:
-        subprocess.run(["pkill", "-9", "-f", "google-chrome"], capture_output=True)
-    time.sleep(2)
+    # Only stop Chrome instances on our dedicated profile; the user's own
+    # windows use a different user-data-dir and don't block the CDP port.
+    chrome_data_dir = Path.home() / ".chrome_bot"
+    profile_arg = f"--user-data-dir={chrome_data_dir}"
+    terminate_processes(profile_arg)
 
     # Start Chrome with CDP using dedicated profile
-    chrome_data_dir = Path.home() / ".chrome_bot"
     # Clean up stale lock file left after force kill
     singleton_lock = chrome_data_dir / "SingletonLock"
     singleton_lock.unlink(missing_ok=True)
@@ -148,7 +322,7 @@ def ensure_chrome_cdp() -> bool:
     chrome_args = [
         chrome_bin,
         f"--remote-debugging-port={CDP_PORT}",
-        f"--user-data-dir={chrome_data_dir}",
+        profile_arg,
     ]
     if headless_mode or (display == XVFB_DISPLAY):
         chrome_args.append("--headless=new")
@@ -158,20 +332,22 @@ def ensure_chrome_cdp() -> bool:
     if display:
         env["DISPLAY"] = display
 
-    subprocess.Popen(
-        chrome_args,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-        env=env,
-    )
+    # stderr goes to a file rather than a pipe: nobody drains it once we return,
+    # and a full pipe would stall the long-lived Chrome process.
+    chrome_data_dir.mkdir(parents=True, exist_ok=True)
+    stderr_log = chrome_data_dir / "chrome_stderr.log"
+    with open(stderr_log, "wb") as stderr_file:
+        proc = subprocess.Popen(
+            chrome_args,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr_file,
+            env=env,
+        )
 
-    # Wait for CDP to be ready
-    for _ in range(5):
-        time.sleep(1)
-        if is_port_open(CDP_PORT):
-            print("Chrome CDP 已就绪")
-            time.sleep(2)  # Extra wait for full initialization
-            return True
+    # Wait for CDP to be ready; a 200 from /json/version means DevTools accepts connections
+    if wait_for_cdp(CDP_PORT, proc=proc, stderr_log=stderr_log):
+        print("Chrome CDP 已就绪")
+        return True
 
     print("Chrome 启动超时")
     return False
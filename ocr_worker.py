@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+常驻 PaddleOCR 进程
+只加载一次模型，加载完先输出一行 {"ready": true}，
+之后从 stdin 读取二进制请求帧，每个请求输出一行 JSON 到 stdout:
+    请求: 4 字节小端图片数 N，随后 N 个 (4 字节小端长度 + 图片字节)
+    响应: {"texts": ["...", "...", ...]}  或  {"error": "..."}
+图片字节在内存里解码，不经过临时文件；
+一个请求里的多张图交给同一次 predict 调用，模型开销在整批上摊薄。
+
+需要在 PaddleOCR 的环境里运行 (由 twitter_search.py 在 ~/paddle-ocr 下 uv run 启动)。
+
+可选环境变量:
+    OCR_DET_MODEL_NAME / OCR_DET_MODEL_DIR  检测模型 (例如换成本地量化后的模型)
+    OCR_REC_MODEL_NAME / OCR_REC_MODEL_DIR  识别模型
+    OCR_CPU_THREADS                         推理线程数，默认 CPU 核数的一半
+"""
+
+import json
+import os
+import sys
+
+
+def _read_exact(stream, size: int) -> bytes | None:
+    """读满 size 字节；读到 EOF 返回 None"""
+    data = stream.read(size)
+    return data if len(data) == size else None
+
+
+def _read_request(stream) -> list[bytes] | None:
+    """读一个请求帧，返回图片字节列表；stdin 关闭时返回 None"""
+    header = _read_exact(stream, 4)
+    if header is None:
+        return None
+    images = []
+    for _ in range(int.from_bytes(header, "little")):
+        length = _read_exact(stream, 4)
+        image = _read_exact(stream, int.from_bytes(length, "little")) if length else None
+        if image is None:
+            return None
+        images.append(image)
+    return images
+
+
+def _make_decoder():
+    """返回 bytes -> BGR 数组的解码函数；装了 PyTurboJPEG 时 JPEG 用 libjpeg-turbo 解码，其余交给 OpenCV"""
+    import cv2
+    import numpy as np
+
+    def cv2_decode(image: bytes):
+        return cv2.imdecode(np.frombuffer(image, np.uint8), cv2.IMREAD_COLOR)
+
+    try:
+        from turbojpeg import TurboJPEG
+        jpeg = TurboJPEG()
+    except (ImportError, RuntimeError, OSError):  # 没装包或找不到 libturbojpeg
+        return cv2_decode
+
+    def decode(image: bytes):
+        if image[:3] == b"\xff\xd8\xff":
+            return jpeg.decode(image)  # 默认输出 BGR，和 cv2.imdecode 一致
+        return cv2_decode(image)
+
+    return decode
+
+
+# 环境变量 -> PaddleOCR 参数，用于替换成量化模型等
+MODEL_ENV_OPTIONS = {
+    "OCR_DET_MODEL_NAME": "text_detection_model_name",
+    "OCR_DET_MODEL_DIR": "text_detection_model_dir",
+    "OCR_REC_MODEL_NAME": "text_recognition_model_name",
+    "OCR_REC_MODEL_DIR": "text_recognition_model_dir",
+}
+
+
+def main():
+    # 模型加载时 Paddle 会往 stdout 打日志，把 fd 1 指到 stderr，
+    # 响应只写到复制出来的原 stdout，保证协议每行都是 JSON
+    out = os.fdopen(os.dup(1), "w", buffering=1, encoding="utf-8")
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    from paddleocr import PaddleOCR
+
+    model_options = {arg: os.environ[env] for env, arg in MODEL_ENV_OPTIONS.items() if os.environ.get(env)}
+    cpu_threads = int(os.environ.get("OCR_CPU_THREADS") or max(1, (os.cpu_count() or 2) // 2))
+
+    # 一次只识别一张截图，小批量可以显著降低内存占用
+    ocr = PaddleOCR(
+        use_doc_orientation_classify=False,
+        use_doc_unwarping=False,
+        use_textline_orientation=False,
+        text_recognition_batch_size=1,
+        enable_mkldnn=True,  # CPU 上走 oneDNN 内核，量化模型在 VNNI CPU 上收益最大
+        cpu_threads=cpu_threads,
+        **model_options,
+    )
+
+    decode = _make_decoder()
+    # 告诉调用方模型已加载，可以开始写请求
+    out.write(json.dumps({"ready": True}) + "\n")
+
+    stdin = sys.stdin.buffer
+    while (images := _read_request(stdin)) is not None:
+        try:
+            # 解码后的数组直接交给 predict，缩放/归一化由 Paddle 内部的 C++ 算子完成；
+            # 以后如果要加逐像素的预处理，用 cv2/numpy 向量化或 numba，不要写 Python 循环
+            arrays = [decode(image) for image in images]
+            if any(array is None for array in arrays):
+                raise ValueError("图片解码失败")
+            # predict 对列表输入按顺序每张图返回一个结果
+            results = ocr.predict(arrays) if arrays else []
+            reply = {"texts": ["\n".join(res["rec_texts"]) for res in results]}
+        except Exception as e:
+            reply = {"error": str(e)}
+        out.write(json.dumps(reply, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 测试提取单条推文的详细信息
-从 tweets_xhr_test.json 读取一条推文，打开详情页分析
+从 tweets_xhr_test.ndjson 读取一条推文，打开详情页分析
 """
 
 import asyncio
@@ -10,20 +10,20 @@ import sys
 from playwright.async_api import async_playwright
 
 async def main():
-    # 读取之前抓到的推文数据
+    # 读取之前抓到的推文数据 (NDJSON，每行一条)，只需要第一条
     try:
-        with open('tweets_xhr_test.json', 'r', encoding='utf-8') as f:
-            tweets = json.load(f)
+        with open('tweets_xhr_test.ndjson', 'r', encoding='utf-8') as f:
+            first_line = next((line for line in f if line.strip()), None)
     except FileNotFoundError:
-        print("❌ 找不到 tweets_xhr_test.json，请先运行 tw_xhr_test.py")
+        print("❌ 找不到 tweets_xhr_test.ndjson，请先运行 tw_xhr_test.py")
         return
     
-    if not tweets:
-        print("❌ JSON 文件为空")
+    if not first_line:
+        print("❌ NDJSON 文件为空")
         return
     
     # 取第一条推文
-    tweet = tweets[0]
+    tweet = json.loads(first_line)
     tweet_id = tweet['id']
     
     print(f"📝 测试推文:")
@@ -40,7 +40,7 @@ async def main():
     async with async_playwright() as p:
         # 连接到已有的 Chrome
         try:
-            browser = await p.chromium.connect_over_cdp("http://localhost:9222")
+            browser = await p.chromium.connect_over_cdp("http://127.0.0.1:9222")
         except Exception as e:
             print(f"❌ 无法连接到 Chrome CDP: {e}")
             return
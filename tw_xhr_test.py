@@ -6,9 +6,24 @@
 
 import asyncio
 import json
+import re
 import sys
 from playwright.async_api import async_playwright
 
+# orjson 直接解析 bytes，比标准库 json 快数倍；未安装时回退到 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson else json.loads
+
+def _json_line(obj) -> bytes:
+    """序列化为一行 NDJSON"""
+    if orjson:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode('utf-8')
+
 # Twitter API 相关的 URL 模式
 TWITTER_API_PATTERNS = [
     'api.twitter.com',
@@ -18,63 +33,85 @@ TWITTER_API_PATTERNS = [
     'TweetDetail'
 ]
 
-captured_tweets = []
+# 所有模式合并成一个正则，每个 URL 只扫描一遍
+_CAPTURE_RE = re.compile("|".join(re.escape(p) for p in TWITTER_API_PATTERNS)).search
+
+# 推文边解析边写入 NDJSON（每行一条），内存里只留计数和前几条示例
+OUTPUT_PATH = 'tweets_xhr_test.ndjson'
+SAMPLE_SIZE = 3
+
+output_file = None
+captured_count = 0
+sample_tweets = []
 
-async def should_capture(url: str) -> bool:
+def save_tweets(tweets: list):
+    """追加写入推文并立即 flush，中途崩溃也能保留已抓到的部分"""
+    global captured_count
+    if output_file is None or output_file.closed:
+        return
+    output_file.write(b"".join(_json_line(t) for t in tweets))
+    output_file.flush()
+    captured_count += len(tweets)
+    if len(sample_tweets) < SAMPLE_SIZE:
+        sample_tweets.extend(tweets[:SAMPLE_SIZE - len(sample_tweets)])
+
+def should_capture(url: str) -> bool:
     """判断是否应该捕获这个请求"""
-    return any(pattern in url for pattern in TWITTER_API_PATTERNS)
+    return _CAPTURE_RE(url) is not None
+
+def _iter_timeline_entries(data: dict):
+    """遍历 data.*.(home_timeline_urt|timeline_urt).instructions 中的所有 TimelineAddEntries 条目"""
+    for value in data.values():
+        if not isinstance(value, dict):
+            continue
+        # 尝试多种可能的路径
+        timeline = value.get('home_timeline_urt') or value.get('timeline_urt') or value
+        for instruction in timeline.get('instructions', ()):
+            if instruction.get('type') == 'TimelineAddEntries':
+                yield from instruction.get('entries', ())
 
-async def parse_twitter_response(response_body: str) -> list:
+async def parse_twitter_response(response_body: bytes) -> list:
     """解析 Twitter API 响应，提取推文"""
     try:
-        data = json.loads(response_body)
-        tweets = []
+        data = _json_loads(response_body)
         
         # Twitter API 响应结构：data.home.home_timeline_urt.instructions
-        if 'data' not in data:
+        if not isinstance(data, dict):
+            return []
+        data = data.get('data')
+        if not isinstance(data, dict):
             return []
         
-        # 遍历可能的嵌套结构
-        for key, value in data.get('data', {}).items():
-            if isinstance(value, dict):
-                # 尝试多种可能的路径
-                timeline = value.get('home_timeline_urt') or value.get('timeline_urt') or value
-                instructions = timeline.get('instructions', [])
-                
-                for instruction in instructions:
-                    instr_type = instruction.get('type')
-                    
-                    if instr_type == 'TimelineAddEntries':
-                        entries = instruction.get('entries', [])
-                        
-                        for entry in entries:
-                            content = entry.get('content', {})
-                            entry_type = content.get('entryType')
-                            
-                            if entry_type == 'TimelineTimelineItem':
-                                item_content = content.get('itemContent', {})
-                                item_type = item_content.get('itemType')
-                                
-                                if item_type == 'TimelineTweet':
-                                    tweet_results = item_content.get('tweet_results', {})
-                                    result = tweet_results.get('result', {})
-                                    typename = result.get('__typename')
-                                    
-                                    if typename == 'Tweet':
-                                        legacy = result.get('legacy', {})
-                                        user = result.get('core', {}).get('user_results', {}).get('result', {}).get('legacy', {})
-                                        
-                                        tweet = {
-                                            'text': legacy.get('full_text', ''),
-                                            'user_name': user.get('name', ''),
-                                            'screen_name': user.get('screen_name', ''),
-                                            'created_at': legacy.get('created_at', ''),
-                                            'favorite_count': legacy.get('favorite_count', 0),
-                                            'retweet_count': legacy.get('retweet_count', 0),
-                                            'id': legacy.get('id_str', ''),
-                                        }
-                                        if tweet['text']:  # 只添加有内容的推文
-                                            tweets.append(tweet)
+        tweets = []
+        append = tweets.append
+        for entry in _iter_timeline_entries(data):
+            try:
+                content = entry['content']
+                if content['entryType'] != 'TimelineTimelineItem':
+                    continue
+                item_content = content['itemContent']
+                if item_content['itemType'] != 'TimelineTweet':
+                    continue
+                result = item_content['tweet_results']['result']
+                if result['__typename'] != 'Tweet':
+                    continue
+                legacy = result['legacy']
+                user = result['core']['user_results']['result']['legacy']
+            except (KeyError, TypeError):
+                continue
+            
+            text = legacy.get('full_text', '')
+            if not text:  # 只添加有内容的推文
+                continue
+            append({
+                'text': text,
+                'user_name': user.get('name', ''),
+                'screen_name': user.get('screen_name', ''),
+                'created_at': legacy.get('created_at', ''),
+                'favorite_count': legacy.get('favorite_count', 0),
+                'retweet_count': legacy.get('retweet_count', 0),
+                'id': legacy.get('id_str', ''),
+            })
         
         return tweets
     except Exception as e:
@@ -83,77 +120,89 @@ async def parse_twitter_response(response_body: str) -> list:
         traceback.print_exc()
         return []
 
+async def handle_response(response):
+    """response 监听器：捕获 Twitter API 的 JSON 响应并提取推文"""
+    url = response.url
+    if should_capture(url):
+        content_type = response.headers.get('content-type', '')
+        # 只处理 JSON 响应，跳过 JS 文件
+        if 'json' not in content_type:
+            return
+        
+        print(f"\n🎯 捕获 API: ...{url[-60:]}")
+        try:
+            # 直接取原始 bytes，省掉一次 UTF-8 解码
+            body = await response.body()
+            tweets = await parse_twitter_response(body)
+            if tweets:
+                print(f"✅ 提取 {len(tweets)} 条推文")
+                # 所有页面共用一个事件循环，写入之间不会交错，无需加锁
+                save_tweets(tweets)
+        except Exception as e:
+            print(f"  ❌ 错误: {str(e)[:100]}")
+
+async def capture(context, url: str, seconds: float, page=None):
+    """在一个页面上打开 url 并监听 seconds 秒；未传入 page 时新建并在结束后关闭"""
+    own_page = page is None
+    if own_page:
+        page = await context.new_page()
+    
+    page.on('response', handle_response)
+    try:
+        print(f"\n🌐 导航到 {url} ...")
+        try:
+            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+        except Exception as e:
+            print(f"⚠️  导航超时或失败: {e}")
+            print("  (可能已经在 Twitter 页面，继续监听...)")
+        
+        # 等待一段时间收集数据
+        await asyncio.sleep(seconds)
+    finally:
+        page.remove_listener('response', handle_response)
+        if own_page:
+            await page.close()
+
 async def main():
+    global output_file
     print("🚀 启动 Twitter XHR 拦截测试...")
+    # 可传入多个时间线 URL 并发抓取，默认首页
+    urls = sys.argv[1:] or ['https://twitter.com/home']
     
     async with async_playwright() as p:
         # 连接到已有的 Chrome (端口 9222)
         try:
-            browser = await p.chromium.connect_over_cdp("http://localhost:9222")
+            browser = await p.chromium.connect_over_cdp("http://127.0.0.1:9222")
         except Exception as e:
-            print(f"❌ 无法连接到 Chrome CDP (localhost:9222): {e}")
+            print(f"❌ 无法连接到 Chrome CDP (127.0.0.1:9222): {e}")
             print("请先运行: google-chrome --remote-debugging-port=9222")
             return
         
-        # 使用第一个已有页面或创建新页面
         contexts = browser.contexts
-        if contexts:
-            context = contexts[0]
-            pages = context.pages
-            if pages:
-                page = pages[0]
-            else:
-                page = await context.new_page()
-        else:
+        if not contexts:
             print("❌ 没有可用的浏览器上下文")
             return
+        context = contexts[0]
         
-        print(f"📄 使用页面: {page.url}")
-        
-        # 启用网络监听
-        async def handle_response(response):
-            url = response.url
-            if await should_capture(url):
-                content_type = response.headers.get('content-type', '')
-                # 只处理 JSON 响应，跳过 JS 文件
-                if 'json' not in content_type:
-                    return
-                
-                print(f"\n🎯 捕获 API: ...{url[-60:]}")
-                try:
-                    body = await response.text()
-                    tweets = await parse_twitter_response(body)
-                    if tweets:
-                        print(f"✅ 提取 {len(tweets)} 条推文")
-                        captured_tweets.extend(tweets)
-                except Exception as e:
-                    print(f"  ❌ 错误: {str(e)[:100]}")
-        
-        page.on('response', handle_response)
-        
-        # 打开 Twitter
-        print("\n🌐 导航到 Twitter...")
-        try:
-            await page.goto('https://twitter.com/home', wait_until='networkidle', timeout=30000)
-        except Exception as e:
-            print(f"⚠️  导航超时或失败: {e}")
-            print("  (可能已经在 Twitter 页面，继续监听...)")
-        
-        # 等待一段时间收集数据
-        print("\n⏳ 监听 15 秒，滚动页面可触发更多请求...")
-        await asyncio.sleep(15)
+        print(f"\n💾 推文实时写入 {OUTPUT_PATH}")
+        with open(OUTPUT_PATH, 'wb') as output_file:
+            print("\n⏳ 监听 15 秒，滚动页面可触发更多请求...")
+            if len(urls) == 1 and context.pages:
+                # 单个 URL 时沿用第一个已有页面
+                page = context.pages[0]
+                print(f"📄 使用页面: {page.url}")
+                await capture(context, urls[0], 15, page=page)
+            else:
+                # 多个时间线共用一个 CDP 连接，各开一个页面并发抓取
+                await asyncio.gather(*(capture(context, u, 15) for u in urls))
         
         # 输出结果
-        print(f"\n\n📊 总共捕获 {len(captured_tweets)} 条推文")
+        print(f"\n\n📊 总共捕获 {captured_count} 条推文")
         
-        if captured_tweets:
-            print("\n💾 保存到 tweets_xhr_test.json")
-            with open('tweets_xhr_test.json', 'w', encoding='utf-8') as f:
-                json.dump(captured_tweets, f, ensure_ascii=False, indent=2)
-            
+        if sample_tweets:
             # 打印前 3 条
             print("\n📋 示例推文:")
-            for i, tweet in enumerate(captured_tweets[:3], 1):
+            for i, tweet in enumerate(sample_tweets, 1):
                 print(f"\n{i}. @{tweet['screen_name']} ({tweet['created_at']})")
                 print(f"   {tweet['text'][:100]}...")
                 print(f"   ❤️ {tweet['favorite_count']} | 🔁 {tweet['retweet_count']}")
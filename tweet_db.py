@@ -455,37 +455,48 @@ def mark_bookmarked(tweet_url: str = None, tweet_id: int = None, bookmarked: boo
             conn.close()
 
 
-def save_xhr_tweets_from_json(json_file: str) -> int:
+def save_xhr_tweets_from_json(json_file: str, batch_size: int = 1000) -> int:
     """
-    从 XHR 拦截的 JSON 文件批量保存推文
-    
+    从 XHR 拦截的 NDJSON 文件批量保存推文
+
+    逐行读取，每 batch_size 条写一次数据库，大文件也不用整个读进内存。
+
     Args:
-        json_file: JSON 文件路径（tweets_xhr_test.json 等）
-    
+        json_file: NDJSON 文件路径（tw_xhr_test.py 输出的 tweets_xhr_test.ndjson，每行一条推文）
+        batch_size: 每批写入的推文数
+
     Returns:
         成功保存的推文数量
     """
     import json
-    
+
+    saved = 0
+    batch = []
     try:
         with open(json_file, 'r', encoding='utf-8') as f:
-            data_list = json.load(f)
-        
-        if not isinstance(data_list, list):
-            print(f"❌ JSON 文件格式错误，期望列表")
-            return 0
-        
-        tweets = [tweet_from_xhr_json(d) for d in data_list]
-        saved = save_tweets(tweets)
-        print(f"✅ 从 {json_file} 保存了 {saved} 条推文")
-        return saved
-        
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"⚠️ 第 {line_no} 行 JSON 解析失败，已跳过: {e}")
+                    continue
+                if not isinstance(data, dict):
+                    print(f"⚠️ 第 {line_no} 行不是推文对象，已跳过")
+                    continue
+                batch.append(tweet_from_xhr_json(data))
+                if len(batch) >= batch_size:
+                    saved += save_tweets(batch)
+                    batch = []
+        saved += save_tweets(batch)
+
     except FileNotFoundError:
         print(f"❌ 文件不存在: {json_file}")
-        return 0
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON 解析失败: {e}")
-        return 0
+        return saved
+
+    print(f"✅ 从 {json_file} 保存了 {saved} 条推文")
+    return saved
 
 
 def get_recent_tweets(limit: int = 20, data_source: str = None) -> list[dict]:
@@ -550,10 +561,10 @@ if __name__ == "__main__":
                     print(f"  └─ ID:{tid} 💬{t.get('reply_count', 0)}")
         
         elif sys.argv[1] == "import-xhr":
-            # 导入 XHR JSON 数据
+            # 导入 XHR NDJSON 数据
             if len(sys.argv) < 3:
-                print("Usage: python tweet_db.py import-xhr <json_file>")
-                print("Example: python tweet_db.py import-xhr tweets_xhr_test.json")
+                print("Usage: python tweet_db.py import-xhr <ndjson_file>")
+                print("Example: python tweet_db.py import-xhr tweets_xhr_test.ndjson")
             else:
                 json_file = sys.argv[2]
                 saved = save_xhr_tweets_from_json(json_file)
@@ -584,5 +595,5 @@ Another test tweet content here
     else:
         print("Usage:")
         print("  python tweet_db.py list [ocr|xhr]     - 列出最近推文")
-        print("  python tweet_db.py import-xhr <file>  - 导入XHR JSON数据")
+        print("  python tweet_db.py import-xhr <file>  - 导入XHR NDJSON数据")
         print("  python tweet_db.py test               - 测试OCR解析")
@@ -3,227 +3,308 @@
 Twitter 互动功能模块
 - 点赞 / 取消点赞
 - 收藏 / 取消收藏
+
+批量操作时用 TwitterSession 复用同一个 CDP 连接和页面:
+
+    with TwitterSession() as s:
+        s.like(url1)
+        s.bookmark(url2)
+
+优先用浏览器里的登录 cookie 直接调用 GraphQL 接口；接口失败
+(queryId 过期、未登录等) 时回退到打开页面点击按钮。
 """
 
+import http.client
+import json
 import re
-import time
+import urllib.error
+import urllib.request
+from typing import NamedTuple
 
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from playwright.sync_api import Page, sync_playwright, TimeoutError as PlaywrightTimeout
 
 from chrome_utils import CDP_URL, ensure_chrome_cdp
 
 
+_STATUS_RE = re.compile(r"/status/(\d+)")
+
+# x.com 网页版公开使用的 Bearer token
+WEB_BEARER_TOKEN = (
+    "AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs%3D"
+    "1Zv7ttfk8LF81IUq16cHjhLTvJu4FA33AGWWjCpTnA"
+)
+GRAPHQL_URL = "https://x.com/i/api/graphql/{query_id}/{operation}"
+# 接口请求超时：走不通就尽快回退到页面操作
+GRAPHQL_TIMEOUT = 3
+# 拿不到浏览器 UA 时使用的 User-Agent
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# 操作 -> (queryId, operationName)；queryId 会随网页版更新而变，失效时自动回退到页面操作
+GRAPHQL_OPERATIONS = {
+    "like": ("lI07N6Otwv1PhnEgXILM7A", "FavoriteTweet"),
+    "unlike": ("ZYKSe-w7KEslx3JhSIk5LA", "UnfavoriteTweet"),
+    "bookmark": ("aoDbu3RHznuiSkQ9aNM67Q", "CreateBookmark"),
+    "unbookmark": ("Wlmlj2-xzyS1GN3a6cj-mQ", "DeleteBookmark"),
+}
+
+
+class ToggleAction(NamedTuple):
+    """一种互动操作：点击 current 按钮后它变为 target 按钮"""
+    current: str  # 操作前按钮的 data-testid
+    target: str   # 操作后按钮的 data-testid
+    done_msg: str
+    doing_msg: str
+    ok_msg: str
+    fail_msg: str
+
+
+# 同步版和 asyncio 版 (twitter_actions_async) 共用
+TOGGLE_ACTIONS = {
+    "like": ToggleAction(
+        "like", "unlike",
+        done_msg="⚠️ 这条推文已经点过赞了",
+        doing_msg="❤️ 点赞中...",
+        ok_msg="✅ 点赞成功！",
+        fail_msg="❌ 点赞可能失败",
+    ),
+    "unlike": ToggleAction(
+        "unlike", "like",
+        done_msg="⚠️ 这条推文没有点过赞",
+        doing_msg="💔 取消点赞中...",
+        ok_msg="✅ 取消点赞成功！",
+        fail_msg="❌ 取消点赞可能失败",
+    ),
+    "bookmark": ToggleAction(
+        "bookmark", "removeBookmark",
+        done_msg="⚠️ 这条推文已经收藏过了",
+        doing_msg="🔖 收藏中...",
+        ok_msg="✅ 收藏成功！",
+        fail_msg="❌ 收藏可能失败",
+    ),
+    "unbookmark": ToggleAction(
+        "removeBookmark", "bookmark",
+        done_msg="⚠️ 这条推文没有收藏过",
+        doing_msg="🗑️ 取消收藏中...",
+        ok_msg="✅ 取消收藏成功！",
+        fail_msg="❌ 取消收藏可能失败",
+    ),
+}
+
+
 def extract_tweet_id(url: str) -> str | None:
     """从 URL 提取推文 ID"""
-    match = re.search(r"/status/(\d+)", url)
+    match = _STATUS_RE.search(url)
     return match.group(1) if match else None
 
 
-def like_tweet(url: str) -> bool:
-    """点赞推文"""
-    if not ensure_chrome_cdp():
-        return False
+def focal_tweet_selector(tweet_id: str) -> str:
+    """推文页上目标推文的 article：它的时间链接指向自己的 /status/<id>
 
-    tweet_id = extract_tweet_id(url)
-    if not tweet_id:
-        print(f"❌ 无效的推文 URL: {url}")
-        return False
+    推文页里还有上文和回复，它们也带点赞/收藏按钮，按钮必须限定在这个 article 里找。
+    """
+    return f'article:has(a[href$="/status/{tweet_id}"])'
 
-    with sync_playwright() as p:
-        try:
-            browser = p.chromium.connect_over_cdp(CDP_URL)
-        except Exception as e:
-            print(f"❌ 无法连接 CDP ({CDP_URL}): {e}")
-            return False
 
-        context = browser.contexts[0]
-        page = context.new_page()
+class TwitterSession:
+    """复用同一个 Playwright 连接和页面执行多次互动操作"""
+
+    def __init__(self):
+        self._pw = None
+        self.browser = None
+        self.context = None
+        self._page: Page | None = None
+        self._api_headers: dict | None = None
+        # 接口第一次失败 (网络不通、HTTP 错误等) 后，本会话剩下的操作直接走页面
+        self.api_broken = False
 
+    def __enter__(self) -> "TwitterSession":
+        if not ensure_chrome_cdp():
+            raise ConnectionError("Chrome CDP 不可用")
+        self._pw = sync_playwright().start()
         try:
-            print(f"📍 导航到推文页面...")
-            page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            # 等待任一按钮出现 (like 或 unlike)
-            page.wait_for_selector('[data-testid="like"], [data-testid="unlike"]', timeout=30000)
-            time.sleep(1)
-
-            # 检查是否已点赞
-            unlike_btn = page.locator('[data-testid="unlike"]').first
-            
-            if unlike_btn.count() > 0:
-                print("⚠️ 这条推文已经点过赞了")
-                return True
-
-            print("❤️ 点赞中...")
-            like_btn = page.locator('[data-testid="like"]').first
-            like_btn.click()
-            time.sleep(1)
-
-            # 验证点赞成功
-            if page.locator('[data-testid="unlike"]').count() > 0:
-                print("✅ 点赞成功！")
-                return True
-            else:
-                print("❌ 点赞可能失败")
-                return False
-
-        except PlaywrightTimeout as e:
-            print(f"❌ 超时: {e}")
-            return False
+            self.browser = self._pw.chromium.connect_over_cdp(CDP_URL)
         except Exception as e:
-            print(f"❌ 错误: {e}")
-            return False
+            self._pw.stop()
+            self._pw = None
+            raise ConnectionError(f"无法连接 CDP ({CDP_URL}): {e}") from e
+        self.context = self.browser.contexts[0]
+        return self
+
+    @property
+    def page(self) -> Page:
+        """页面按需创建：走 API 的操作根本不需要渲染页面"""
+        if self._page is None:
+            self._page = self.context.new_page()
+        return self._page
+
+    def api_headers(self) -> dict | None:
+        """从浏览器 cookie 构造 GraphQL 请求头；未登录时返回 None"""
+        if self._api_headers is None:
+            cookies = {c["name"]: c["value"] for c in self.context.cookies("https://x.com")}
+            if "auth_token" not in cookies or "ct0" not in cookies:
+                return None
+            self._api_headers = {
+                "user-agent": self._user_agent(),
+                "authorization": f"Bearer {WEB_BEARER_TOKEN}",
+                "x-csrf-token": cookies["ct0"],
+                "cookie": "; ".join(f"{k}={v}" for k, v in cookies.items()),
+                "content-type": "application/json",
+                "x-twitter-auth-type": "OAuth2Session",
+                "x-twitter-active-user": "yes",
+            }
+        return self._api_headers
+
+    def _user_agent(self) -> str:
+        """用浏览器自己的 UA，请求看起来和网页发出的一致"""
+        try:
+            cdp = self.browser.new_browser_cdp_session()
+            try:
+                return cdp.send("Browser.getVersion")["userAgent"]
+            finally:
+                cdp.detach()
+        except Exception:
+            return DEFAULT_USER_AGENT
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # 页面只在会话结束时关闭一次，批量操作的每一步都不再等待 page.close()。
+        # sync_playwright 的对象绑定在创建它的线程上，不能丢到后台线程去关。
+        try:
+            if self._page is not None:
+                self._page.close()
         finally:
-            page.close()
+            self._page = None
+            if self._pw is not None:
+                self._pw.stop()
+                self._pw = None
 
+    def like(self, url: str) -> bool:
+        return like_tweet(url, session=self)
 
-def unlike_tweet(url: str) -> bool:
-    """取消点赞"""
-    if not ensure_chrome_cdp():
-        return False
+    def unlike(self, url: str) -> bool:
+        return unlike_tweet(url, session=self)
 
-    tweet_id = extract_tweet_id(url)
-    if not tweet_id:
-        print(f"❌ 无效的推文 URL: {url}")
-        return False
+    def bookmark(self, url: str) -> bool:
+        return bookmark_tweet(url, session=self)
 
-    with sync_playwright() as p:
-        try:
-            browser = p.chromium.connect_over_cdp(CDP_URL)
-        except Exception as e:
-            print(f"❌ 无法连接 CDP ({CDP_URL}): {e}")
-            return False
+    def unbookmark(self, url: str) -> bool:
+        return unbookmark_tweet(url, session=self)
 
-        context = browser.contexts[0]
-        page = context.new_page()
 
-        try:
-            print(f"📍 导航到推文页面...")
-            page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            time.sleep(2)
-
-            unlike_btn = page.locator('[data-testid="unlike"]').first
-            
-            if unlike_btn.count() == 0:
-                print("⚠️ 这条推文没有点过赞")
-                return True
-
-            print("💔 取消点赞中...")
-            unlike_btn.click()
-            time.sleep(1)
+def _graphql(session: TwitterSession, op: str, tweet_id: str) -> bool:
+    """直接调用 GraphQL 接口完成操作，成功返回 True；任何失败返回 False 交给页面操作兜底"""
+    if session.api_broken:
+        return False
+    try:
+        headers = session.api_headers()
+    except Exception:
+        session.api_broken = True
+        return False
+    if headers is None:
+        return False
 
-            print("✅ 取消点赞成功！")
-            return True
+    query_id, operation = GRAPHQL_OPERATIONS[op]
+    payload = json.dumps({"variables": {"tweet_id": tweet_id}, "queryId": query_id}).encode()
+    request = urllib.request.Request(
+        GRAPHQL_URL.format(query_id=query_id, operation=operation),
+        data=payload,
+        headers=headers,
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=GRAPHQL_TIMEOUT) as response:
+            body = json.loads(response.read())
+    except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError):
+        # urllib 不走 Chrome 的代理，x.com 可能根本连不上；记住失败，不让每个操作都等超时
+        session.api_broken = True
+        return False
+    if not isinstance(body, dict):
+        return False
+    # 已点赞/已收藏等情况接口会返回 errors，交给页面逻辑判断状态
+    return bool(body.get("data")) and not body.get("errors")
 
-        except PlaywrightTimeout as e:
-            print(f"❌ 超时: {e}")
-            return False
-        except Exception as e:
-            print(f"❌ 错误: {e}")
-            return False
-        finally:
-            page.close()
 
+def _perform(session: TwitterSession, op: str, url: str, tweet_id: str) -> bool:
+    if _graphql(session, op, tweet_id):
+        print(TOGGLE_ACTIONS[op].ok_msg)
+        return True
+    return _toggle(session.page, url, tweet_id, TOGGLE_ACTIONS[op])
 
-def bookmark_tweet(url: str) -> bool:
-    """收藏推文"""
-    if not ensure_chrome_cdp():
-        return False
 
+def _run(op: str, url: str, session: TwitterSession | None) -> bool:
+    """校验 URL 后在指定会话中执行操作；没有会话时临时开一个"""
     tweet_id = extract_tweet_id(url)
     if not tweet_id:
         print(f"❌ 无效的推文 URL: {url}")
         return False
 
-    with sync_playwright() as p:
-        try:
-            browser = p.chromium.connect_over_cdp(CDP_URL)
-        except Exception as e:
-            print(f"❌ 无法连接 CDP ({CDP_URL}): {e}")
-            return False
+    if session is not None:
+        return _perform(session, op, url, tweet_id)
 
-        context = browser.contexts[0]
-        page = context.new_page()
+    try:
+        with TwitterSession() as s:
+            return _perform(s, op, url, tweet_id)
+    except ConnectionError as e:
+        print(f"❌ {e}")
+        return False
 
-        try:
-            print(f"📍 导航到推文页面...")
-            page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            # 等待任一按钮出现 (bookmark 或 removeBookmark)
-            page.wait_for_selector('[data-testid="bookmark"], [data-testid="removeBookmark"]', timeout=30000)
-            time.sleep(1)
-
-            # 检查是否已收藏
-            unbookmark_btn = page.locator('[data-testid="removeBookmark"]').first
-            
-            if unbookmark_btn.count() > 0:
-                print("⚠️ 这条推文已经收藏过了")
-                return True
-
-            print("🔖 收藏中...")
-            bookmark_btn = page.locator('[data-testid="bookmark"]').first
-            bookmark_btn.click()
-            time.sleep(1)
-
-            # 验证收藏成功
-            if page.locator('[data-testid="removeBookmark"]').count() > 0:
-                print("✅ 收藏成功！")
-                return True
-            else:
-                print("❌ 收藏可能失败")
-                return False
-
-        except PlaywrightTimeout as e:
-            print(f"❌ 超时: {e}")
-            return False
-        except Exception as e:
-            print(f"❌ 错误: {e}")
-            return False
-        finally:
-            page.close()
 
+def _toggle(page: Page, url: str, tweet_id: str, action: ToggleAction) -> bool:
+    """打开推文页，若目标推文上是 current 按钮则点击并等待它变为 target 按钮
 
-def unbookmark_tweet(url: str) -> bool:
-    """取消收藏"""
-    if not ensure_chrome_cdp():
-        return False
+    按钮只在目标推文的 article 里找：回复推文也有同样的按钮。
+    """
+    try:
+        print(f"📍 导航到推文页面...")
+        # 导航提交即返回，下面的选择器等待才是真正的就绪条件
+        page.goto(url, wait_until="commit", timeout=15000)
+        tweet = page.locator(focal_tweet_selector(tweet_id)).first
+        # 等待任一按钮出现
+        either = f'[data-testid="{action.current}"], [data-testid="{action.target}"]'
+        tweet.locator(either).first.wait_for(timeout=30000)
 
-    tweet_id = extract_tweet_id(url)
-    if not tweet_id:
-        print(f"❌ 无效的推文 URL: {url}")
-        return False
+        current_btn = tweet.locator(f'[data-testid="{action.current}"]')
+        if current_btn.count() == 0:
+            print(action.done_msg)
+            return True
+
+        print(action.doing_msg)
+        current_btn.click()
 
-    with sync_playwright() as p:
+        # 验证操作成功：按钮变为 target 即返回
         try:
-            browser = p.chromium.connect_over_cdp(CDP_URL)
-        except Exception as e:
-            print(f"❌ 无法连接 CDP ({CDP_URL}): {e}")
+            tweet.locator(f'[data-testid="{action.target}"]').wait_for(state="attached", timeout=3000)
+        except PlaywrightTimeout:
+            print(action.fail_msg)
             return False
+        print(action.ok_msg)
+        return True
 
-        context = browser.contexts[0]
-        page = context.new_page()
+    except PlaywrightTimeout as e:
+        print(f"❌ 超时: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ 错误: {e}")
+        return False
 
-        try:
-            print(f"📍 导航到推文页面...")
-            page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            time.sleep(2)
 
-            unbookmark_btn = page.locator('[data-testid="removeBookmark"]').first
-            
-            if unbookmark_btn.count() == 0:
-                print("⚠️ 这条推文没有收藏过")
-                return True
+def like_tweet(url: str, session: TwitterSession | None = None) -> bool:
+    """点赞推文"""
+    return _run("like", url, session)
 
-            print("🗑️ 取消收藏中...")
-            unbookmark_btn.click()
-            time.sleep(1)
 
-            print("✅ 取消收藏成功！")
-            return True
+def unlike_tweet(url: str, session: TwitterSession | None = None) -> bool:
+    """取消点赞"""
+    return _run("unlike", url, session)
 
-        except PlaywrightTimeout as e:
-            print(f"❌ 超时: {e}")
-            return False
-        except Exception as e:
-            print(f"❌ 错误: {e}")
-            return False
-        finally:
-            page.close()
+
+def bookmark_tweet(url: str, session: TwitterSession | None = None) -> bool:
+    """收藏推文"""
+    return _run("bookmark", url, session)
+
+
+def unbookmark_tweet(url: str, session: TwitterSession | None = None) -> bool:
+    """取消收藏"""
+    return _run("unbookmark", url, session)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Twitter 互动功能模块 (asyncio 版)
+- 点赞 / 取消点赞
+- 收藏 / 取消收藏
+
+页面由调用方传入，并发多少由调用方决定:
+
+    async with async_playwright() as p:
+        browser = await p.chromium.connect_over_cdp(CDP_URL)
+        context = browser.contexts[0]
+        pages = [await context.new_page() for _ in urls]
+        await asyncio.gather(*(like_tweet(u, pg) for u, pg in zip(urls, pages)))
+"""
+
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
+
+from twitter_actions import TOGGLE_ACTIONS, ToggleAction, extract_tweet_id, focal_tweet_selector
+
+
+async def _toggle(page: Page, url: str, action: ToggleAction) -> bool:
+    """打开推文页，若目标推文上是 current 按钮则点击并等待它变为 target 按钮
+
+    和同步版 twitter_actions._toggle 使用同一张 TOGGLE_ACTIONS 表；按钮只在目标推文的 article 里找。
+    """
+    tweet_id = extract_tweet_id(url)
+    if not tweet_id:
+        print(f"❌ 无效的推文 URL: {url}")
+        return False
+
+    try:
+        print(f"📍 导航到推文页面...")
+        await page.goto(url, wait_until="commit", timeout=15000)
+        tweet = page.locator(focal_tweet_selector(tweet_id)).first
+        either = f'[data-testid="{action.current}"], [data-testid="{action.target}"]'
+        await tweet.locator(either).first.wait_for(timeout=30000)
+
+        current_btn = tweet.locator(f'[data-testid="{action.current}"]')
+        if await current_btn.count() == 0:
+            print(action.done_msg)
+            return True
+
+        print(action.doing_msg)
+        await current_btn.click()
+
+        try:
+            await tweet.locator(f'[data-testid="{action.target}"]').wait_for(state="attached", timeout=3000)
+        except PlaywrightTimeout:
+            print(action.fail_msg)
+            return False
+        print(action.ok_msg)
+        return True
+
+    except PlaywrightTimeout as e:
+        print(f"❌ 超时: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ 错误: {e}")
+        return False
+
+
+async def like_tweet(url: str, page: Page) -> bool:
+    """点赞推文"""
+    return await _toggle(page, url, TOGGLE_ACTIONS["like"])
+
+
+async def unlike_tweet(url: str, page: Page) -> bool:
+    """取消点赞"""
+    return await _toggle(page, url, TOGGLE_ACTIONS["unlike"])
+
+
+async def bookmark_tweet(url: str, page: Page) -> bool:
+    """收藏推文"""
+    return await _toggle(page, url, TOGGLE_ACTIONS["bookmark"])
+
+
+async def unbookmark_tweet(url: str, page: Page) -> bool:
+    """取消收藏"""
+    return await _toggle(page, url, TOGGLE_ACTIONS["unbookmark"])
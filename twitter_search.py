@@ -4,15 +4,28 @@ Twitter 搜索功能模块
 - 搜索关键字
 - 搜索用户推文
 - 搜索用户资料
+
+内部基于 playwright.async_api：一次调用内的所有查询/用户共用一个 CDP 连接，
+从页面池 (最多 MAX_PARALLEL_PAGES 个页面) 里取页面并发执行，网络等待互相重叠，
+页面用完放回池里给下一个查询复用，不再每次新建/关闭。
 """
 
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import select
 import subprocess
 import sys
 import tempfile
 import time
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
+from typing import Awaitable, Callable
 
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import BrowserContext, CDPSession, Page, async_playwright, TimeoutError as PlaywrightTimeout
 
 from chrome_utils import CDP_URL, ensure_chrome_cdp
 
@@ -20,6 +33,23 @@ from chrome_utils import CDP_URL, ensure_chrome_cdp
 # PaddleOCR 脚本路径
 PADDLE_OCR_DIR = Path.home() / "paddle-ocr"
 
+# OCR 结果缓存目录，按截图内容哈希命名
+OCR_CACHE_DIR = Path.home() / ".cache" / "twpost" / "ocr"
+
+# 登录态 (cookies + localStorage) 快照：Chrome 重启后默认上下文没有 x.com cookies 时用它新建上下文
+STORAGE_STATE_PATH = Path.home() / ".cache" / "twpost" / "storage.json"
+# 快照最多一天刷新一次
+STORAGE_STATE_MAX_AGE = 24 * 3600
+
+# 常驻 OCR 进程脚本，在 PADDLE_OCR_DIR 的环境里运行
+OCR_WORKER_SCRIPT = Path(__file__).resolve().parent / "ocr_worker.py"
+# 等待常驻进程加载完模型 (发回 ready) 的超时
+OCR_WORKER_START_TIMEOUT = 120
+# 单次识别 (写入请求 + 等待结果) 的超时
+OCR_WORKER_TIMEOUT = 120
+
+OCR_ENV = {**os.environ, "PADDLE_PDX_DISABLE_MODEL_SOURCE_CHECK": "True"}
+
 # 常用用户 (Albert 时间线上常见的人)
 KNOWN_USERS = {
     # 格式: "昵称/备注": "username"
@@ -30,9 +60,372 @@ KNOWN_USERS = {
 DEFAULT_WIDTH = 1280
 DEFAULT_HEIGHT = 4000
 
+# OCR 截图只取中间推文栏 (1280 宽布局下约 x=260~900)，两侧导航和推荐栏对 OCR 是噪声
+OCR_CLIP_X = 260
+OCR_CLIP_WIDTH = 640
+OCR_JPEG_QUALITY = 85
+
+# 滚动后等待新推文出现、页面加载后等待网络空闲的上限 (毫秒)
+SCROLL_LOAD_TIMEOUT = 5000
+NETWORK_IDLE_TIMEOUT = 5000
+
+# 每次滚动一屏，推文数变多 (或超时) 就继续下一次，最后回到顶部稍等渲染。
+# 用 setTimeout 轮询而不是 requestAnimationFrame：后台标签页里 rAF 不触发
+SCROLL_FEED_JS = """async ([times, timeout]) => {
+    const count = () => document.querySelectorAll('[data-testid=tweet]').length;
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+    for (let i = 0; i < times; i++) {
+        const prev = count();
+        window.scrollBy(0, window.innerHeight);
+        const deadline = Date.now() + timeout;
+        while (count() <= prev && Date.now() < deadline) {
+            await sleep(100);
+        }
+    }
+    window.scrollTo(0, 0);
+    await sleep(500);
+}"""
+
+EXTRACT_TWEETS_JS = """nodes => nodes.map(n => ({
+    author: n.querySelector('[data-testid="User-Name"]')?.innerText ?? null,
+    text: n.querySelector('[data-testid="tweetText"]')?.innerText ?? null,
+    time: n.querySelector('time')?.getAttribute('datetime') ?? null,
+}))"""
+
+# 页面池大小，即批量模式下同时打开的页面数上限
+MAX_PARALLEL_PAGES = 3
+
+# 搜索过滤类型 -> URL 参数
+SEARCH_FILTERS = {
+    "top": "",
+    "latest": "&f=live",
+    "people": "&f=user",
+    "photos": "&f=image",
+    "videos": "&f=video",
+}
+
+# 用户页类型 -> URL 路径
+USER_TABS = {
+    "tweets": "",
+    "replies": "/with_replies",
+    "highlights": "/highlights",
+    "media": "/media",
+    "likes": "/likes",
+}
+
+# 拦截不需要的资源：读 DOM 时图片/样式/字体/视频都用不上；
+# 要截图时保留图片和样式，只挡字体和视频
+DOM_BLOCKED_RESOURCES = frozenset({"image", "media", "font", "stylesheet"})
+SCREENSHOT_BLOCKED_RESOURCES = frozenset({"media", "font"})
+
+# 这些搜索类型的结果里没有推文 article，DOM 读不到内容，一开始就按截图加载
+SCREENSHOT_ONLY_FILTERS = frozenset({"people"})
+
+
+def _resource_blocker(blocked: frozenset[str]):
+    """生成 route 处理函数：屏蔽指定类型的资源和统计脚本"""
+    async def handle(route):
+        request = route.request
+        if request.resource_type in blocked or "analytics" in request.url:
+            await route.abort()
+        else:
+            await route.continue_()
+    return handle
+
+
+def _write_private(path: Path, data: bytes) -> None:
+    """只有自己可读写地原子写入文件 (登录 cookie)：目录 0700，文件创建时就是 0600"""
+    path.parent.parent.mkdir(parents=True, exist_ok=True)
+    path.parent.mkdir(mode=0o700, exist_ok=True)
+    os.chmod(path.parent, 0o700)  # 目录可能已被 OCR 缓存按默认权限创建
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class _BrowserSession:
+    """一次调用内共享的浏览器上下文 + 页面池"""
+
+    def __init__(self, context: BrowserContext, size: int = MAX_PARALLEL_PAGES):
+        self.context = context
+        self._size = size
+        self._created = 0
+        self._pages: list[Page] = []
+        self._idle: asyncio.Queue[Page] = asyncio.Queue()
+        self._cdp: dict[Page, CDPSession] = {}
+        self._blockers: dict[Page, Callable] = {}
+        self._state_checked = False
+
+    @asynccontextmanager
+    async def page(self, height: int | None = None, blocked: frozenset[str] = frozenset()):
+        """借出一个页面，用完自动归还；池满时等待其他任务归还
+
+        blocked 中的资源类型在借用期间被拦截 (只作用于这个页面，不影响用户的其他标签页)。
+        """
+        if self._idle.empty() and self._created < self._size:
+            self._created += 1
+            page = await self.context.new_page()
+            self._pages.append(page)
+        else:
+            page = await self._idle.get()
+        try:
+            if height is not None:
+                await self._set_viewport(page, height)
+            await self.set_blocked(page, blocked)
+            yield page
+        finally:
+            await self.set_blocked(page, frozenset())
+            self._idle.put_nowait(page)
+
+    async def set_blocked(self, page: Page, blocked: frozenset[str]) -> None:
+        """替换借出页面的资源拦截规则，对之后的请求生效"""
+        old = self._blockers.pop(page, None)
+        if old:
+            try:
+                await page.unroute("**/*", old)
+            except Exception:
+                pass
+        if blocked:
+            blocker = _resource_blocker(blocked)
+            await page.route("**/*", blocker)
+            self._blockers[page] = blocker
+
+    async def _set_viewport(self, page: Page, height: int) -> None:
+        """设置 viewport，并把 DPR 固定为 1：高 DPR 屏幕上 4000 像素高的截图要渲染好几倍像素"""
+        await page.set_viewport_size({"width": DEFAULT_WIDTH, "height": height})
+        try:
+            if page not in self._cdp:
+                self._cdp[page] = await self.context.new_cdp_session(page)
+            await self._cdp[page].send("Emulation.setDeviceMetricsOverride", {
+                "width": DEFAULT_WIDTH,
+                "height": height,
+                "deviceScaleFactor": 1,
+                "mobile": False,
+            })
+        except Exception as e:
+            print(f"⚠️ 设置 DPR 失败: {e}", file=sys.stderr)
+
+    async def save_storage_state(self) -> None:
+        """页面成功打开后保存登录态快照；每次调用只检查一次，快照不满一天不重写"""
+        if self._state_checked:
+            return
+        self._state_checked = True
+        try:
+            if time.time() - STORAGE_STATE_PATH.stat().st_mtime < STORAGE_STATE_MAX_AGE:
+                return
+        except OSError:
+            pass
+        try:
+            if not await self.context.cookies("https://x.com"):
+                return  # 没登录，不要用空状态覆盖旧快照
+            state = await self.context.storage_state()
+            _write_private(STORAGE_STATE_PATH, json.dumps(state).encode())
+        except Exception as e:
+            print(f"⚠️ 登录态保存失败: {e}", file=sys.stderr)
+
+    async def close(self):
+        for page in self._pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        self._pages.clear()
+        self._cdp.clear()
+        self._blockers.clear()
+
+
+Job = Callable[[_BrowserSession], Awaitable]
+
+
+def _ocr_cache_path(image: bytes) -> Path:
+    """根据截图内容计算缓存文件路径"""
+    digest = hashlib.blake2b(image, digest_size=16).hexdigest()
+    return OCR_CACHE_DIR / f"{digest}.txt"
+
+
+def _save_ocr_cache(cache_path: Path, text: str) -> None:
+    """原子写入缓存：先写临时文件再 rename，避免并发读到半截内容"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ OCR 缓存写入失败: {e}", file=sys.stderr)
+
+
+def run_paddle_ocr(image: bytes | str) -> str | None:
+    """调用 PaddleOCR 识别图片 (图片字节或文件路径)；同样内容的截图直接返回缓存结果"""
+    return run_paddle_ocr_batch([image])[0]
+
+
+def run_paddle_ocr_batch(images: list[bytes | str]) -> list[str | None]:
+    """批量识别多张图片，未命中缓存的图片合并成一次 OCR 调用；结果与输入一一对应"""
+    results: list[str | None] = [None] * len(images)
+    datas: list[bytes | None] = []
+    for image in images:
+        if isinstance(image, str):
+            try:
+                image = Path(image).read_bytes()
+            except OSError as e:
+                print(f"❌ 读取图片失败: {e}", file=sys.stderr)
+                image = None
+        datas.append(image)
+
+    cache_paths = [_ocr_cache_path(data) if data else None for data in datas]
+    misses = []
+    for i, cache_path in enumerate(cache_paths):
+        if cache_path is None:
+            continue
+        if cache_path.exists():
+            results[i] = cache_path.read_text(encoding="utf-8")
+        else:
+            misses.append(i)
+
+    hits = sum(1 for r in results if r is not None)
+    if hits:
+        print(f"⚡ 命中 OCR 缓存 {hits} 张", file=sys.stderr)
+    if not misses:
+        return results
+
+    texts = _run_paddle_ocr_uncached([datas[i] for i in misses])
+    for i, text in zip(misses, texts):
+        results[i] = text
+        if text:
+            _save_ocr_cache(cache_paths[i], text)
+    return results
+
+
+# 常驻 OCR 进程：首次识别时启动，模型只加载一次；所有截图抓完后在主线程里统一识别
+_ocr_worker: subprocess.Popen | None = None
+_ocr_worker_broken = False
+
+
+def _start_ocr_worker() -> subprocess.Popen:
+    """启动常驻进程并等它加载完模型；超时或启动失败时抛 OSError"""
+    worker = subprocess.Popen(
+        ["uv", "run", "python", str(OCR_WORKER_SCRIPT)],
+        cwd=PADDLE_OCR_DIR,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=OCR_ENV,
+    )
+    # 请求可能有几 MB，超过管道缓冲后阻塞写会卡死；改成非阻塞写 + select 超时
+    os.set_blocking(worker.stdin.fileno(), False)
+    try:
+        line = _read_worker_line(worker, time.monotonic() + OCR_WORKER_START_TIMEOUT)
+        if not json.loads(line).get("ready"):
+            raise OSError("OCR 进程启动失败")
+    except (OSError, ValueError):
+        worker.kill()
+        worker.wait()
+        raise
+    return worker
+
+
+def _read_worker_line(worker: subprocess.Popen, deadline: float) -> bytes:
+    """在 deadline 前读一行响应；超时或进程退出时抛 OSError"""
+    ready, _, _ = select.select([worker.stdout], [], [], max(0.0, deadline - time.monotonic()))
+    line = worker.stdout.readline() if ready else b""
+    if not line:
+        raise OSError("OCR 进程无响应或已退出")
+    return line
+
+
+def _write_worker(worker: subprocess.Popen, data: bytes, deadline: float) -> None:
+    """在 deadline 前把 data 全部写进 worker 的 stdin (非阻塞 fd)"""
+    fd = worker.stdin.fileno()
+    view = memoryview(data)
+    while view:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise OSError("写入 OCR 请求超时")
+        _, writable, _ = select.select([], [fd], [], remaining)
+        if not writable:
+            continue
+        try:
+            view = view[os.write(fd, view):]
+        except BlockingIOError:
+            continue
+
+
+def _stop_ocr_worker() -> None:
+    global _ocr_worker
+    worker, _ocr_worker = _ocr_worker, None
+    if worker is None or worker.poll() is not None:
+        return
+    try:
+        worker.stdin.close()  # worker 读到 EOF 后自行退出
+        worker.wait(timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        worker.kill()
+
+
+atexit.register(_stop_ocr_worker)
+
+
+def _ocr_via_worker(images: list[bytes]) -> list[str | None]:
+    """整批图片字节直接写给常驻进程识别，不落盘；进程不可用时抛 OSError
+
+    请求帧: 4 字节小端图片数 N，随后 N 个 (4 字节小端长度 + 图片字节)
+    """
+    global _ocr_worker
+    frame = bytearray(len(images).to_bytes(4, "little"))
+    for image in images:
+        frame += len(image).to_bytes(4, "little")
+        frame += image
+
+    if _ocr_worker is None or _ocr_worker.poll() is not None:
+        _ocr_worker = _start_ocr_worker()
+    worker = _ocr_worker
+    deadline = time.monotonic() + OCR_WORKER_TIMEOUT
+    try:
+        _write_worker(worker, frame, deadline)
+        line = _read_worker_line(worker, deadline)
+    except OSError:
+        worker.kill()  # 无响应的进程不会自己读到 EOF 退出
+        _stop_ocr_worker()
+        raise
+
+    reply = json.loads(line)
+    if "error" in reply:
+        print(f"❌ OCR 失败: {reply['error']}", file=sys.stderr)
+        return [None] * len(images)
+    return [text.strip() or None for text in reply["texts"]]
+
+
+def _run_paddle_ocr_uncached(images: list[bytes]) -> list[str | None]:
+    """优先用常驻进程识别，启动失败后退回逐张 uv run ocr.py"""
+    global _ocr_worker_broken
+    if not _ocr_worker_broken:
+        try:
+            return _ocr_via_worker(images)
+        except (OSError, ValueError, KeyError) as e:
+            _ocr_worker_broken = True
+            print(f"⚠️ OCR 常驻进程不可用 ({e})，改为单次调用", file=sys.stderr)
+    return [_run_paddle_ocr_once(image) for image in images]
+
+
+def _run_paddle_ocr_once(image: bytes) -> str | None:
+    """单次调用 ocr.py：它只接受文件路径，所以先写一个临时文件"""
+    suffix = ".jpg" if image[:3] == b"\xff\xd8\xff" else ".png"
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        f.write(image)
+        image_path = f.name
+    try:
+        return _run_ocr_script(image_path)
+    finally:
+        Path(image_path).unlink(missing_ok=True)
+
 
-def run_paddle_ocr(image_path: str) -> str | None:
-    """调用 PaddleOCR 识别图片"""
+def _run_ocr_script(image_path: str) -> str | None:
     try:
         result = subprocess.run(
             ["uv", "run", "python", "ocr.py", image_path],
@@ -40,10 +433,7 @@ def run_paddle_ocr(image_path: str) -> str | None:
             capture_output=True,
             text=True,
             timeout=60,
-            env={
-                **dict(__import__("os").environ),
-                "PADDLE_PDX_DISABLE_MODEL_SOURCE_CHECK": "True"
-            }
+            env=OCR_ENV,
         )
         if result.returncode == 0:
             return result.stdout.strip()
@@ -55,92 +445,187 @@ def run_paddle_ocr(image_path: str) -> str | None:
         return None
 
 
-def search_keyword(
+async def _run_jobs(jobs: list[Job]) -> list:
+    """连接 CDP，用同一个页面池并发执行 jobs，按顺序返回结果"""
+    if not ensure_chrome_cdp():
+        return [None] * len(jobs)
+
+    async with async_playwright() as p:
+        try:
+            browser = await p.chromium.connect_over_cdp(CDP_URL)
+        except Exception as e:
+            print(f"❌ 无法连接 CDP ({CDP_URL}): {e}", file=sys.stderr)
+            return [None] * len(jobs)
+
+        context, owned = await _open_context(browser)
+        session = _BrowserSession(context)
+        try:
+            return await asyncio.gather(*(job(session) for job in jobs))
+        finally:
+            await session.close()
+            if owned:
+                await context.close()
+
+
+async def _open_context(browser) -> tuple[BrowserContext, bool]:
+    """
+    选择浏览器上下文
+
+    默认用 Chrome 自带的上下文；它没有 x.com cookies (例如 profile 被清掉)
+    而本地有登录态快照时，用快照新建一个上下文，返回 (上下文, 是否需要调用方关闭)
+    """
+    context = browser.contexts[0]
+    if not STORAGE_STATE_PATH.exists() or await context.cookies("https://x.com"):
+        return context, False
+    print("🔑 默认上下文未登录，使用保存的登录态", file=sys.stderr)
+    try:
+        return await browser.new_context(storage_state=STORAGE_STATE_PATH), True
+    except Exception as e:
+        print(f"⚠️ 登录态加载失败: {e}", file=sys.stderr)
+        return context, False
+
+
+async def _scroll_feed(page, scroll_times: int) -> None:
+    """滚动加载更多推文后回到顶部；整个循环在页面里一次 evaluate 跑完"""
+    if scroll_times > 0:
+        print(f"📜 滚动加载 {scroll_times} 次...", file=sys.stderr)
+    await page.evaluate(SCROLL_FEED_JS, [scroll_times, SCROLL_LOAD_TIMEOUT])
+
+
+async def _extract_tweets(page) -> list[dict]:
+    """一次 evaluate 直接从 DOM 读出所有推文的作者、正文和时间"""
+    return await page.locator('article[data-testid="tweet"]').evaluate_all(EXTRACT_TWEETS_JS)
+
+
+async def _take_screenshot(page, output_image: str | None) -> bytes:
+    """
+    截图并返回图片字节，供 OCR 使用 (不经过临时文件)
+
+    默认只截中间推文栏的 JPEG，像素和字节都少得多 (viewport 不是 DEFAULT_WIDTH 宽时截整个 viewport)；
+    指定了 output_image 时截完整页面给用户看，OCR 也用这张。
+    """
+    print("📸 截图中...", file=sys.stderr)
+    # 冻结 CSS 动画、隐藏光标，截图不必等动画帧
+    options = {"animations": "disabled", "caret": "hide"}
+    if output_image:
+        image = await page.screenshot(path=output_image, full_page=False, **options)
+        print(f"💾 截图已保存: {output_image}", file=sys.stderr)
+        return image
+
+    viewport = page.viewport_size
+    if viewport and viewport["width"] == DEFAULT_WIDTH:
+        # 推文栏的位置只在 DEFAULT_WIDTH 宽的布局下是固定的
+        options["clip"] = {"x": OCR_CLIP_X, "y": 0, "width": OCR_CLIP_WIDTH, "height": viewport["height"]}
+    return await page.screenshot(type="jpeg", quality=OCR_JPEG_QUALITY, **options)
+
+
+async def _capture_feed(
+    session: _BrowserSession,
+    page,
+    scroll_times: int,
+    output_image: str | None,
+    use_ocr: bool,
+    blocked: frozenset[str],
+) -> tuple[list[dict] | None, bytes | None]:
+    """
+    滚动后抓取推文 (搜索页和用户页共用)
+
+    blocked 是页面加载时拦截的资源；要退回截图 OCR 而图片/样式被挡掉了时，
+    先换成截图用的拦截规则重新加载页面。
+
+    Returns:
+        (DOM 推文列表, 待 OCR 的截图字节)；DOM 读到推文时不需要 OCR，截图为 None
+    """
+    await _scroll_feed(page, scroll_times)
+
+    tweets = None if use_ocr else await _extract_tweets(page)
+    if tweets:
+        if output_image:
+            # 只为保存截图，不做 OCR
+            await _take_screenshot(page, output_image)
+        return tweets, None
+
+    if not use_ocr:
+        print("⚠️ 页面上没有读到推文，改用截图 OCR", file=sys.stderr)
+    if blocked - SCREENSHOT_BLOCKED_RESOURCES:
+        await session.set_blocked(page, SCREENSHOT_BLOCKED_RESOURCES)
+        await page.reload(wait_until="domcontentloaded", timeout=60000)
+        try:
+            await page.wait_for_selector('[data-testid="primaryColumn"]', timeout=30000)
+        except PlaywrightTimeout:
+            pass
+        await _wait_network_idle(page)
+    return None, await _take_screenshot(page, output_image)
+
+
+async def _wait_network_idle(page) -> None:
+    """等待页面网络空闲，最多 NETWORK_IDLE_TIMEOUT 毫秒"""
+    try:
+        await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT)
+    except PlaywrightTimeout:
+        pass
+
+
+def _finish_captures(captures: list[tuple[list[dict] | None, bytes | None] | None]) -> list[str | None]:
+    """DOM 推文转成 JSON 文本，其余截图合并成一次批量 OCR"""
+    texts = _ocr_screenshots([c[1] if c else None for c in captures])
+    for i, capture in enumerate(captures):
+        if capture and capture[0]:
+            texts[i] = json.dumps(capture[0], ensure_ascii=False, indent=2)
+    return texts
+
+
+def _ocr_screenshots(images: list[bytes | None]) -> list[str | None]:
+    """所有页面截完图后一次性批量 OCR"""
+    indexes = [i for i, image in enumerate(images) if image]
+    texts: list[str | None] = [None] * len(images)
+    if not indexes:
+        return texts
+
+    print(f"🔍 OCR 识别中 ({len(indexes)} 张)...", file=sys.stderr)
+    for i, text in zip(indexes, run_paddle_ocr_batch([images[i] for i in indexes])):
+        texts[i] = text
+    return texts
+
+
+def _resolve_username(username: str) -> str:
+    """去掉开头的 @，已知昵称换成用户名"""
+    if username.startswith("@"):
+        username = username[1:]
+    return KNOWN_USERS.get(username, username)
+
+
+async def _search_keyword_async(
+    session: _BrowserSession,
     query: str,
     filter_type: str = "top",
     scroll_times: int = 1,
     output_image: str | None = None,
     height: int = DEFAULT_HEIGHT,
-) -> str | None:
-    """
-    搜索关键字
-    
-    Args:
-        query: 搜索关键字
-        filter_type: 过滤类型 (top/latest/people/photos/videos)
-        scroll_times: 滚动次数
-        output_image: 保存截图路径
-        height: viewport 高度
-    
-    Returns:
-        OCR 提取的文字
-    """
-    if not ensure_chrome_cdp():
-        return None
-
+    use_ocr: bool = False,
+) -> tuple[list[dict] | None, bytes | None] | None:
+    """打开搜索页抓取推文，返回 _capture_feed 的结果"""
     # 构建搜索 URL
-    filter_map = {
-        "top": "",
-        "latest": "&f=live",
-        "people": "&f=user",
-        "photos": "&f=image",
-        "videos": "&f=video",
-    }
-    filter_param = filter_map.get(filter_type, "")
+    filter_param = SEARCH_FILTERS.get(filter_type, "")
     url = f"https://x.com/search?q={query}{filter_param}"
 
-    with sync_playwright() as p:
-        try:
-            browser = p.chromium.connect_over_cdp(CDP_URL)
-        except Exception as e:
-            print(f"❌ 无法连接 CDP ({CDP_URL}): {e}", file=sys.stderr)
-            return None
-
-        context = browser.contexts[0]
-        page = context.new_page()
-        page.set_viewport_size({"width": DEFAULT_WIDTH, "height": height})
-
+    needs_screenshot = use_ocr or output_image or filter_type in SCREENSHOT_ONLY_FILTERS
+    blocked = SCREENSHOT_BLOCKED_RESOURCES if needs_screenshot else DOM_BLOCKED_RESOURCES
+    async with session.page(height, blocked) as page:
         try:
             print(f"🔍 搜索: {query} (类型: {filter_type})...", file=sys.stderr)
-            page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+
             # 等待搜索结果
             try:
-                page.wait_for_selector('[data-testid="tweet"], [data-testid="UserCell"]', timeout=30000)
+                await page.wait_for_selector('[data-testid="tweet"], [data-testid="UserCell"]', timeout=30000)
             except PlaywrightTimeout:
-                page.wait_for_selector('[data-testid="primaryColumn"]', timeout=10000)
-            
-            time.sleep(2)
-            
-            # 滚动加载更多
-            for i in range(scroll_times):
-                print(f"📜 滚动加载 ({i + 1}/{scroll_times})...", file=sys.stderr)
-                page.evaluate("window.scrollBy(0, window.innerHeight)")
-                time.sleep(1.5)
-            
-            page.evaluate("window.scrollTo(0, 0)")
-            time.sleep(0.5)
-            
-            # 截图
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-                screenshot_path = f.name
-            
-            print("📸 截图中...", file=sys.stderr)
-            page.screenshot(path=screenshot_path, full_page=False)
-            
-            if output_image:
-                import shutil
-                shutil.copy(screenshot_path, output_image)
-                print(f"💾 截图已保存: {output_image}", file=sys.stderr)
-            
-            # OCR
-            print("🔍 OCR 识别中...", file=sys.stderr)
-            result = run_paddle_ocr(screenshot_path)
-            Path(screenshot_path).unlink(missing_ok=True)
-            
-            if result:
-                print("✅ 搜索完成", file=sys.stderr)
-            return result
+                await page.wait_for_selector('[data-testid="primaryColumn"]', timeout=10000)
+
+            await _wait_network_idle(page)
+            await session.save_storage_state()
+
+            return await _capture_feed(session, page, scroll_times, output_image, use_ocr, blocked)
 
         except PlaywrightTimeout as e:
             print(f"❌ 超时: {e}", file=sys.stderr)
@@ -148,102 +633,39 @@ def search_keyword(
         except Exception as e:
             print(f"❌ 错误: {e}", file=sys.stderr)
             return None
-        finally:
-            page.close()
 
 
-def search_user_tweets(
+async def _search_user_tweets_async(
+    session: _BrowserSession,
     username: str,
     filter_type: str = "tweets",
     scroll_times: int = 1,
     output_image: str | None = None,
     height: int = DEFAULT_HEIGHT,
-) -> str | None:
-    """
-    查看某用户的推文
-    
-    Args:
-        username: 用户名 (不带@)
-        filter_type: tweets/replies/highlights/media/likes
-        scroll_times: 滚动次数
-        output_image: 保存截图路径
-        height: viewport 高度
-    
-    Returns:
-        OCR 提取的文字
-    """
-    if not ensure_chrome_cdp():
-        return None
-
-    # 检查是否是已知用户昵称
-    if username in KNOWN_USERS:
-        username = KNOWN_USERS[username]
-    
-    # 去掉可能的 @ 符号
-    username = username.lstrip("@")
+    use_ocr: bool = False,
+) -> tuple[list[dict] | None, bytes | None] | None:
+    """打开用户页抓取推文，返回 _capture_feed 的结果"""
+    username = _resolve_username(username)
 
     # 构建 URL
-    url_map = {
-        "tweets": f"https://x.com/{username}",
-        "replies": f"https://x.com/{username}/with_replies",
-        "highlights": f"https://x.com/{username}/highlights",
-        "media": f"https://x.com/{username}/media",
-        "likes": f"https://x.com/{username}/likes",
-    }
-    url = url_map.get(filter_type, url_map["tweets"])
-
-    with sync_playwright() as p:
-        try:
-            browser = p.chromium.connect_over_cdp(CDP_URL)
-        except Exception as e:
-            print(f"❌ 无法连接 CDP ({CDP_URL}): {e}", file=sys.stderr)
-            return None
-
-        context = browser.contexts[0]
-        page = context.new_page()
-        page.set_viewport_size({"width": DEFAULT_WIDTH, "height": height})
+    url = f"https://x.com/{username}{USER_TABS.get(filter_type, '')}"
 
+    blocked = SCREENSHOT_BLOCKED_RESOURCES if use_ocr or output_image else DOM_BLOCKED_RESOURCES
+    async with session.page(height, blocked) as page:
         try:
             print(f"👤 查看用户 @{username} 的 {filter_type}...", file=sys.stderr)
-            page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+
             # 等待内容加载
             try:
-                page.wait_for_selector('[data-testid="tweet"], [data-testid="primaryColumn"]', timeout=30000)
+                await page.wait_for_selector('[data-testid="tweet"], [data-testid="primaryColumn"]', timeout=30000)
             except PlaywrightTimeout:
                 pass
-            
-            time.sleep(2)
-            
-            # 滚动
-            for i in range(scroll_times):
-                print(f"📜 滚动加载 ({i + 1}/{scroll_times})...", file=sys.stderr)
-                page.evaluate("window.scrollBy(0, window.innerHeight)")
-                time.sleep(1.5)
-            
-            page.evaluate("window.scrollTo(0, 0)")
-            time.sleep(0.5)
-            
-            # 截图
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-                screenshot_path = f.name
-            
-            print("📸 截图中...", file=sys.stderr)
-            page.screenshot(path=screenshot_path, full_page=False)
-            
-            if output_image:
-                import shutil
-                shutil.copy(screenshot_path, output_image)
-                print(f"💾 截图已保存: {output_image}", file=sys.stderr)
-            
-            # OCR
-            print("🔍 OCR 识别中...", file=sys.stderr)
-            result = run_paddle_ocr(screenshot_path)
-            Path(screenshot_path).unlink(missing_ok=True)
-            
-            if result:
-                print("✅ 完成", file=sys.stderr)
-            return result
+
+            await _wait_network_idle(page)
+            await session.save_storage_state()
+
+            return await _capture_feed(session, page, scroll_times, output_image, use_ocr, blocked)
 
         except PlaywrightTimeout as e:
             print(f"❌ 超时: {e}", file=sys.stderr)
@@ -251,71 +673,40 @@ def search_user_tweets(
         except Exception as e:
             print(f"❌ 错误: {e}", file=sys.stderr)
             return None
-        finally:
-            page.close()
 
 
-def get_user_profile(username: str) -> dict | None:
-    """
-    获取用户资料
-    
-    Returns:
-        包含用户信息的字典，或 None
-    """
-    if not ensure_chrome_cdp():
-        return None
-
-    username = username.lstrip("@")
-    if username in KNOWN_USERS:
-        username = KNOWN_USERS[username]
-
-    with sync_playwright() as p:
-        try:
-            browser = p.chromium.connect_over_cdp(CDP_URL)
-        except Exception as e:
-            print(f"❌ 无法连接 CDP ({CDP_URL}): {e}", file=sys.stderr)
-            return None
-
-        context = browser.contexts[0]
-        page = context.new_page()
+async def _get_user_profile_async(session: _BrowserSession, username: str) -> tuple[dict, bytes] | None:
+    """读取用户资料并截图，返回 (资料, 截图字节)"""
+    username = _resolve_username(username)
 
+    # 设置 viewport：截图裁剪按 DEFAULT_WIDTH 宽的布局算
+    async with session.page(DEFAULT_HEIGHT, SCREENSHOT_BLOCKED_RESOURCES) as page:
         try:
             print(f"👤 获取用户 @{username} 资料...", file=sys.stderr)
-            page.goto(f"https://x.com/{username}", wait_until="domcontentloaded", timeout=60000)
-            page.wait_for_selector('[data-testid="primaryColumn"]', timeout=30000)
-            time.sleep(2)
+            await page.goto(f"https://x.com/{username}", wait_until="domcontentloaded", timeout=60000)
+            await page.wait_for_selector('[data-testid="primaryColumn"]', timeout=30000)
+            await _wait_network_idle(page)
+            await session.save_storage_state()
 
             profile = {"username": username}
-            
+
             # 获取显示名
             try:
                 name_elem = page.locator('[data-testid="UserName"] span').first
-                profile["name"] = name_elem.text_content()
-            except:
+                profile["name"] = await name_elem.text_content()
+            except Exception:
                 pass
-            
+
             # 获取简介
             try:
                 bio_elem = page.locator('[data-testid="UserDescription"]')
-                if bio_elem.count() > 0:
-                    profile["bio"] = bio_elem.text_content()
-            except:
+                if await bio_elem.count() > 0:
+                    profile["bio"] = await bio_elem.text_content()
+            except Exception:
                 pass
-            
-            # 截图保存
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-                screenshot_path = f.name
-            page.screenshot(path=screenshot_path, full_page=False)
-            
-            # OCR 获取更多信息
-            ocr_text = run_paddle_ocr(screenshot_path)
-            Path(screenshot_path).unlink(missing_ok=True)
-            
-            if ocr_text:
-                profile["ocr_text"] = ocr_text
-            
-            print("✅ 获取完成", file=sys.stderr)
-            return profile
+
+            # 截图供 OCR 获取更多信息
+            return profile, await _take_screenshot(page, None)
 
         except PlaywrightTimeout as e:
             print(f"❌ 超时: {e}", file=sys.stderr)
@@ -323,8 +714,142 @@ def get_user_profile(username: str) -> dict | None:
         except Exception as e:
             print(f"❌ 错误: {e}", file=sys.stderr)
             return None
-        finally:
-            page.close()
+
+
+def search_keyword(
+    query: str,
+    filter_type: str = "top",
+    scroll_times: int = 1,
+    output_image: str | None = None,
+    height: int = DEFAULT_HEIGHT,
+    use_ocr: bool = False,
+) -> str | None:
+    """
+    搜索关键字
+    
+    Args:
+        query: 搜索关键字
+        filter_type: 过滤类型 (top/latest/people/photos/videos)
+        scroll_times: 滚动次数
+        output_image: 保存截图路径
+        height: viewport 高度
+        use_ocr: 强制截图 + OCR (默认直接读 DOM，读不到推文时才 OCR)
+    
+    Returns:
+        推文 JSON 文本，或 OCR 提取的文字
+    """
+    return search_keywords([query], filter_type, scroll_times, [output_image], height, use_ocr)[0]
+
+
+def search_keywords(
+    queries: list[str],
+    filter_type: str = "top",
+    scroll_times: int = 1,
+    output_images: list[str | None] | None = None,
+    height: int = DEFAULT_HEIGHT,
+    use_ocr: bool = False,
+) -> list[str | None]:
+    """并发搜索多个关键字，结果与 queries 一一对应"""
+    output_images = output_images or [None] * len(queries)
+    jobs = [
+        partial(_search_keyword_async, query=q, filter_type=filter_type,
+                scroll_times=scroll_times, output_image=img, height=height, use_ocr=use_ocr)
+        for q, img in zip(queries, output_images)
+    ]
+    texts = _finish_captures(asyncio.run(_run_jobs(jobs)))
+    if any(texts):
+        print("✅ 搜索完成", file=sys.stderr)
+    return texts
+
+
+def search_user_tweets(
+    username: str,
+    filter_type: str = "tweets",
+    scroll_times: int = 1,
+    output_image: str | None = None,
+    height: int = DEFAULT_HEIGHT,
+    use_ocr: bool = False,
+) -> str | None:
+    """
+    查看某用户的推文
+    
+    Args:
+        username: 用户名 (不带@)
+        filter_type: tweets/replies/highlights/media/likes
+        scroll_times: 滚动次数
+        output_image: 保存截图路径
+        height: viewport 高度
+        use_ocr: 强制截图 + OCR (默认直接读 DOM，读不到推文时才 OCR)
+    
+    Returns:
+        推文 JSON 文本，或 OCR 提取的文字
+    """
+    return search_users_tweets([username], filter_type, scroll_times, [output_image], height, use_ocr)[0]
+
+
+def search_users_tweets(
+    usernames: list[str],
+    filter_type: str = "tweets",
+    scroll_times: int = 1,
+    output_images: list[str | None] | None = None,
+    height: int = DEFAULT_HEIGHT,
+    use_ocr: bool = False,
+) -> list[str | None]:
+    """并发查看多个用户的推文，结果与 usernames 一一对应"""
+    output_images = output_images or [None] * len(usernames)
+    jobs = [
+        partial(_search_user_tweets_async, username=u, filter_type=filter_type,
+                scroll_times=scroll_times, output_image=img, height=height, use_ocr=use_ocr)
+        for u, img in zip(usernames, output_images)
+    ]
+    texts = _finish_captures(asyncio.run(_run_jobs(jobs)))
+    if any(texts):
+        print("✅ 完成", file=sys.stderr)
+    return texts
+
+
+def get_user_profile(username: str) -> dict | None:
+    """
+    获取用户资料
+    
+    Returns:
+        包含用户信息的字典，或 None
+    """
+    captured = asyncio.run(_run_jobs([partial(_get_user_profile_async, username=username)]))[0]
+    if captured is None:
+        return None
+    profile, screenshot = captured
+
+    # OCR 获取更多信息
+    ocr_text = _ocr_screenshots([screenshot])[0]
+    if ocr_text:
+        profile["ocr_text"] = ocr_text
+
+    print("✅ 获取完成", file=sys.stderr)
+    return profile
+
+
+def _numbered_images(output_image: str | None, count: int) -> list[str | None]:
+    """批量模式下给每个截图加序号，避免互相覆盖"""
+    if not output_image:
+        return [None] * count
+    if count == 1:
+        return [output_image]
+    path = Path(output_image)
+    return [str(path.with_name(f"{path.stem}_{i}{path.suffix}")) for i in range(1, count + 1)]
+
+
+def _print_results(labels: list[str], texts: list[str | None]) -> bool:
+    """输出结果；多个查询时加标题分隔。任一成功即返回 True"""
+    ok = False
+    for label, text in zip(labels, texts):
+        if not text:
+            continue
+        if len(labels) > 1:
+            print(f"===== {label} =====")
+        print(text)
+        ok = True
+    return ok
 
 
 def main():
@@ -337,8 +862,11 @@ def main():
 示例:
   twsearch "Claude AI"                   # 搜索关键字
   twsearch "Claude AI" -f latest         # 搜索最新
+  twsearch "Claude AI" "Anthropic"       # 同时搜索多个关键字
   twsearch -u elonmusk                   # 查看某用户推文
   twsearch -u elonmusk -t media          # 查看某用户媒体
+  twsearch -u elonmusk sama              # 同时查看多个用户
+  twsearch "Claude AI" --ocr             # 截图 + OCR 识别
   twsearch -p elonmusk                   # 获取用户资料
 
 搜索过滤 (-f/--filter):
@@ -357,14 +885,15 @@ def main():
         """,
     )
     
-    parser.add_argument("query", nargs="?", help="搜索关键字")
-    parser.add_argument("-u", "--user", metavar="USERNAME", help="查看某用户推文")
+    parser.add_argument("query", nargs="*", help="搜索关键字 (可多个)")
+    parser.add_argument("-u", "--user", nargs="+", metavar="USERNAME", help="查看某用户推文 (可多个)")
     parser.add_argument("-p", "--profile", metavar="USERNAME", help="获取用户资料")
-    parser.add_argument("-f", "--filter", choices=["top", "latest", "people", "photos", "videos"], default="top", help="搜索过滤类型")
-    parser.add_argument("-t", "--type", choices=["tweets", "replies", "highlights", "media", "likes"], default="tweets", help="用户推文类型")
+    parser.add_argument("-f", "--filter", choices=list(SEARCH_FILTERS), default="top", help="搜索过滤类型")
+    parser.add_argument("-t", "--type", choices=list(USER_TABS), default="tweets", help="用户推文类型")
     parser.add_argument("-s", "--scroll", type=int, default=1, help="滚动次数")
-    parser.add_argument("-i", "--image", metavar="FILE", help="保存截图")
+    parser.add_argument("-i", "--image", metavar="FILE", help="保存截图 (多个查询时自动加序号)")
     parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT, help="viewport 高度")
+    parser.add_argument("--ocr", action="store_true", help="截图 + OCR 识别 (默认直接读取页面文字)")
 
     args = parser.parse_args()
 
@@ -383,33 +912,27 @@ def main():
 
     # 查看用户推文
     if args.user:
-        text = search_user_tweets(
-            username=args.user,
+        texts = search_users_tweets(
+            usernames=args.user,
             filter_type=args.type,
             scroll_times=args.scroll,
-            output_image=args.image,
+            output_images=_numbered_images(args.image, len(args.user)),
             height=args.height,
+            use_ocr=args.ocr,
         )
-        if text:
-            print(text)
-            sys.exit(0)
-        else:
-            sys.exit(1)
+        sys.exit(0 if _print_results([f"@{u.lstrip('@')}" for u in args.user], texts) else 1)
 
     # 搜索关键字
     if args.query:
-        text = search_keyword(
-            query=args.query,
+        texts = search_keywords(
+            queries=args.query,
             filter_type=args.filter,
             scroll_times=args.scroll,
-            output_image=args.image,
+            output_images=_numbered_images(args.image, len(args.query)),
             height=args.height,
+            use_ocr=args.ocr,
         )
-        if text:
-            print(text)
-            sys.exit(0)
-        else:
-            sys.exit(1)
+        sys.exit(0 if _print_results(args.query, texts) else 1)
 
     parser.print_help()
     sys.exit(1)
@@ -4,23 +4,29 @@
 import argparse
 import sys
 import time
-import re
 from pathlib import Path
 
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
 
 from chrome_utils import CDP_URL, ensure_chrome_cdp
-from twitter_actions import like_tweet, unlike_tweet, bookmark_tweet, unbookmark_tweet
-
-
-def extract_tweet_id(url: str) -> str | None:
-    """Extract tweet ID from URL."""
-    match = re.search(r"/status/(\d+)", url)
-    return match.group(1) if match else None
+from twitter_actions import (
+    extract_tweet_id,
+    like_tweet,
+    unlike_tweet,
+    bookmark_tweet,
+    unbookmark_tweet,
+)
 
 
 def post_tweet(text: str, reply_to: str | None = None, image: str | None = None) -> bool:
     """Post a tweet using Chrome CDP connection."""
+    image_path = None
+    if image:
+        image_path = Path(image).expanduser().resolve()
+        if not image_path.exists():
+            print(f"❌ 图片不存在: {image_path}")
+            return False
+
     if not ensure_chrome_cdp():
         return False
 
@@ -66,20 +72,19 @@ def post_tweet(text: str, reply_to: str | None = None, image: str | None = None)
             editor = page.locator('[data-testid="tweetTextarea_0"]').first
             editor.click()
             time.sleep(0.5)
-            editor.fill(text)
-            time.sleep(0.5)
-
-            # 上传图片（如果有）
-            if image:
-                image_path = Path(image).expanduser().resolve()
-                if not image_path.exists():
-                    print(f"❌ 图片不存在: {image_path}")
-                    return False
 
+            # 先选图片（如果有）：上传由页面在后台进行，和下面输入文字重叠
+            if image_path:
                 print(f"🖼️  上传图片: {image_path}")
                 file_input = page.locator('input[type="file"][accept*="image"]').first
                 file_input.set_input_files(str(image_path))
-                time.sleep(2)  # 等待上传
+
+            editor.fill(text)
+            time.sleep(0.5)
+
+            if image_path:
+                # 预览出现即继续；上传未完成时发送按钮是 aria-disabled，click 会自动等待
+                page.wait_for_selector('[data-testid="attachments"] img', timeout=10000)
 
             # 点击发送按钮
             print("🚀 发送推文...")